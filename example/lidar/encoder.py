@@ -15,6 +15,7 @@ Tweak the PARAMETERS section to change amplitude/phase/omega or the geometry.
 """
 
 from pathlib import Path
+import io
 import math
 import numpy as np
 
@@ -42,37 +43,53 @@ T = 6.0  # seconds shown (1 rev)
 plot_pad = 0
 plot_w = 380
 plot_h = 230
-plot1_origin = (640, 120)  # theta vs t
-plot2_origin = (640, 430)  # delta-theta vs t
+plot_x = 640  # both plots share the time axis
+plot1_origin = (plot_x, 120)  # theta vs t
+plot2_origin = (plot_x, 430)  # delta-theta vs t
 
 # Sampling
 N = 360
 ts = np.linspace(0.0, T, N)
 theta_true = omega * ts
-theta_meas = np.atan2(
-    np.sin(theta_true) + offset_vec[1] / r_outer,
-    np.cos(theta_true) + offset_vec[0] / r_outer,
+theta_meas = np.mod(
+    np.atan2(
+        np.sin(theta_true) + offset_vec[1] / r_outer,
+        np.cos(theta_true) + offset_vec[0] / r_outer,
+    ),
+    2 * np.pi,
 )
-theta_meas[theta_meas < 0] += np.pi * 2
 dtheta = theta_meas - theta_true
 
 
 # -------------------- HELPERS --------------------
+PREC = 1  # decimals for SVG coordinates; sub-0.1px detail is invisible
+
+
+def fmt(v):
+    return f"{v:.{PREC}f}"
+
+
 def poly(points):
-    return " ".join(f"{x:.2f},{y:.2f}" for x, y in points)
+    return " ".join(f"{fmt(x)},{fmt(y)}" for x, y in points)
 
 
 def line(x1, y1, x2, y2):
-    return f'<line x1="{x1:.2f}" y1="{y1:.2f}" x2="{x2:.2f}" y2="{y2:.2f}"/>'
+    return f'<line x1="{fmt(x1)}" y1="{fmt(y1)}" x2="{fmt(x2)}" y2="{fmt(y2)}"/>'
+
+
+def fmt_coords(vals):
+    spec = f"%.{PREC}f"
+    return [spec % v for v in vals.tolist()]
 
 
 def path_from_xy(xs, ys):
-    return "M " + " L ".join(f"{x:.2f},{y:.2f}" for x, y in zip(xs, ys))
+    # xs, ys: coordinate strings from fmt_coords
+    return "M " + " L ".join([x + "," + y for x, y in zip(xs, ys)])
 
 
 def circle(x, y, r, cls=""):
     c = f' class="{cls}"' if cls else ""
-    return f'<circle{c} cx="{x:.2f}" cy="{y:.2f}" r="{r:.2f}"/>'
+    return f'<circle{c} cx="{fmt(x)}" cy="{fmt(y)}" r="{fmt(r)}"/>'
 
 
 def plus(x, y, s=8, cls=""):
@@ -82,7 +99,7 @@ def plus(x, y, s=8, cls=""):
 
 def text(x, y, s, cls="", anchor="start"):
     c = f' class="{cls}"' if cls else ""
-    return f'<text{c} x="{x:.2f}" y="{y:.2f}" text-anchor="{anchor}">{s}</text>'
+    return f'<text{c} x="{fmt(x)}" y="{fmt(y)}" text-anchor="{anchor}">{s}</text>'
 
 
 # -------------------- LEFT PANEL: RING --------------------
@@ -98,25 +115,24 @@ ring_svg.append(circle(cx, cy, r_outer, "ring"))
 ring_svg.append(circle(cx, cy, r_inner, "ring inner"))
 
 # Ticks
-for a in tick_angles:
-    x0 = cx + r_inner * math.cos(a)
-    y0 = cy + r_inner * math.sin(a)
-    x1 = cx + r_outer * math.cos(a)
-    y1 = cy + r_outer * math.sin(a)
-    ring_svg.append(
-        f'<line class="tick" x1="{x0:.2f}" y1="{y0:.2f}" x2="{x1:.2f}" y2="{y1:.2f}"/>'
-    )
+ca, sa = np.cos(tick_angles), np.sin(tick_angles)
+x0s, y0s = cx + r_inner * ca, cy + r_inner * sa
+x1s, y1s = cx + r_outer * ca, cy + r_outer * sa
+ring_svg.extend(
+    f'<line class="tick" x1="{fmt(x0)}" y1="{fmt(y0)}" x2="{fmt(x1)}" y2="{fmt(y1)}"/>'
+    for x0, y0, x1, y1 in zip(x0s.tolist(), y0s.tolist(), x1s.tolist(), y1s.tolist())
+)
 
 # True direction ray (magenta) passes through the rim
 rim_x = cx + r_outer * math.cos(ray_theta)
 rim_y = cy + r_outer * math.sin(ray_theta)
 ring_svg.append(
-    f'<line class="true" x1="{cx:.2f}" y1="{cy:.2f}" x2="{rim_x:.2f}" y2="{rim_y:.2f}"/>'
+    f'<line class="true" x1="{fmt(cx)}" y1="{fmt(cy)}" x2="{fmt(rim_x)}" y2="{fmt(rim_y)}"/>'
 )
 
 # Measured direction is ray from offset center intersecting same rim point
 ring_svg.append(
-    f'<line class="measured" x1="{ox:.2f}" y1="{oy:.2f}" x2="{rim_x:.2f}" y2="{rim_y:.2f}"/>'
+    f'<line class="measured" x1="{fmt(ox)}" y1="{fmt(oy)}" x2="{fmt(rim_x)}" y2="{fmt(rim_y)}"/>'
 )
 
 # Centers
@@ -134,53 +150,48 @@ ring_svg.append(text(720, 100, "measured direction", "label label-measured"))
 
 # -------------------- RIGHT SIDE: PLOTS --------------------
 def axes(x0, y0, w, h, y_arrow=True, x_arrow=True):
-    out = []
-    out.append(line(x0, y0, x0, y0 + h))  # y axis
-    out.append(line(x0, y0 + h, x0 + w, y0 + h))  # x axis
+    # Path data for both axes (one corner subpath) plus optional arrowheads
+    d = f"M {x0:.1f},{y0:.1f} V {y0 + h:.1f} H {x0 + w:.1f}"
     if y_arrow:
-        out.append(
-            f'<path d="M {x0 - 6:.1f},{y0 + 10:.1f} L {x0:.1f},{y0:.1f} L {x0 + 6:.1f},{y0 + 10:.1f}" class="axis"/>'
-        )
+        d += f" M {x0 - 6:.1f},{y0 + 10:.1f} L {x0:.1f},{y0:.1f} L {x0 + 6:.1f},{y0 + 10:.1f}"
     if x_arrow:
-        out.append(
-            f'<path d="M {x0 + w - 10:.1f},{y0 + h - 6:.1f} L {x0 + w:.1f},{y0 + h:.1f} L {x0 + w - 10:.1f},{y0 + h + 6:.1f}" class="axis"/>'
-        )
-    return out
+        d += f" M {x0 + w - 10:.1f},{y0 + h - 6:.1f} L {x0 + w:.1f},{y0 + h:.1f} L {x0 + w - 10:.1f},{y0 + h + 6:.1f}"
+    return d
 
 
-plot_svg = []
+# Axes of both plots drawn as a single path
+plot_svg = [
+    f'<path class="axis" d="{axes(*plot1_origin, plot_w, plot_h)} {axes(*plot2_origin, plot_w, plot_h)}"/>'
+]
 
 # Top plot: theta vs t
 x0, y0 = plot1_origin
 w, h = plot_w, plot_h
-plot_svg += axes(x0, y0, w, h)
 # y max ticks dotted at 2π
 # plot_svg.append(f'<path class="dotted" d="M {x0:.1f},{y0 + 10:.1f} H {x0 + w:.1f}"/>')
 plot_svg.append(text(x0 - 22, y0 + 20, "θ", "label", "end"))
 plot_svg.append(text(x0 + w + 18, y0 + h + 4, "t", "label"))
 
-# Map theta to y (0 -> bottom, 2π -> top-ish)
+# Shared time axis: x coordinates are computed and formatted once for both plots
 t_norm = (ts - ts.min()) / (ts.max() - ts.min())
-x_vals = x0 + plot_pad + (w - 2 * plot_pad) * t_norm
+x_str = fmt_coords(plot_x + plot_pad + (w - 2 * plot_pad) * t_norm)
+
+# Map theta to y (0 -> bottom, 2π -> top-ish)
+theta_scale = (h - 2 * plot_pad) / (2 * math.pi)
 
 
 def y_from_theta(th):
-    th0 = 0.0
-    th1 = 2 * math.pi
-    # th_clip = np.clip(th, th0, th1)
-    y = y0 + h - plot_pad - (h - 2 * plot_pad) * (th - th0) / (th1 - th0)
-    return y
+    return y0 + h - plot_pad - theta_scale * th
 
 
-yt_true = y_from_theta(theta_true)
-yt_meas = y_from_theta(theta_meas)
-plot_svg.append(f'<path class="true" d="{path_from_xy(x_vals, yt_true)}"/>')
-plot_svg.append(f'<path class="measured" d="{path_from_xy(x_vals, yt_meas)}"/>')
+yt_true = fmt_coords(y_from_theta(theta_true))
+yt_meas = fmt_coords(y_from_theta(theta_meas))
+plot_svg.append(f'<path class="true" d="{path_from_xy(x_str, yt_true)}"/>')
+plot_svg.append(f'<path class="measured" d="{path_from_xy(x_str, yt_meas)}"/>')
 
 # Bottom plot: delta-theta vs t (centered around zero)
 x0, y0 = plot2_origin
 w, h = plot_w, plot_h
-plot_svg += axes(x0, y0, w, h)
 plot_svg.append(text(x0 - 18, y0 + 20, "Δθ", "label", "end"))
 plot_svg.append(text(x0 + w + 18, y0 + h + 4, "t", "label"))
 # zero line
@@ -191,9 +202,8 @@ plot_svg.append(
 # Map dtheta to y with symmetric range ~±max|dtheta|
 rng = float(np.max(dtheta) - np.min(dtheta)) * 1.2
 y_mid = y0 + h / 2
-ys = y_mid - dtheta / rng * h
-xs = x0 + w * t_norm
-plot_svg.append(f'<path class="delta" d="{path_from_xy(xs, ys)}"/>')
+ys = fmt_coords(y_mid - dtheta / rng * h)
+plot_svg.append(f'<path class="delta" d="{path_from_xy(x_str, ys)}"/>')
 
 # -------------------- LEGEND FOR RAYS --------------------
 legend = []
@@ -227,27 +237,27 @@ style = """
 """
 
 # -------------------- COMPOSE SVG --------------------
-svg = []
-svg.append(
+buf = io.StringIO(newline="")
+write = buf.write
+write(
     f'<svg xmlns="http://www.w3.org/2000/svg" width="{W}" height="{H}" viewBox="0 0 {W} {H}">'
 )
-svg.append(style)
+write(style)
 
 # Left panel group
-svg.append("<g>")
-svg += ring_svg
-svg += legend
-svg.append("</g>")
+write("<g>")
+buf.writelines(ring_svg)
+buf.writelines(legend)
+write("</g>")
 
 # Right panel group
-svg.append("<g>")
-svg += plot_svg
-svg.append("</g>")
+write("<g>")
+buf.writelines(plot_svg)
+write("</g>")
 
-svg.append("</svg>")
-svg_str = "\n".join(svg)
+write("</svg>")
 
 # -------------------- WRITE FILE --------------------
 out_path = Path("offset_encoder.svg")
-out_path.write_text(svg_str, encoding="utf-8")
+out_path.write_text(buf.getvalue(), encoding="utf-8")
 print(f"Wrote {out_path.resolve()}")
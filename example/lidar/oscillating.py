@@ -4,16 +4,31 @@ Generate an animated SVG of a red laser reflecting from an oscillating flat mirr
 - Physically correct specular reflection per frame (no <script> in the SVG).
 - Mirror rotates back & forth (sinusoidal) about its center.
 - Incident beam animates to the exact facet hit-point; reflected beam animates to the viewport edge.
-- All <animate> blocks have equal-length keyTimes/values arrays.
+- Each beam is a <polyline> with a single <animate> on its points.
+- All <animate> blocks have equal-length values lists sampled at evenly spaced
+  times, so keyTimes is left at its (uniform) default.
 """
 
 import math
 from pathlib import Path
+import numpy as np
+
+PREC = 1  # decimal places for coordinates
+
+
+def fmt(v):
+    return f"{v:.{PREC}f}"
+
+
+def fmt_array(vals):
+    # fmt() over a whole array
+    spec = f"%.{PREC}f"
+    return [spec % v for v in np.asarray(vals, dtype=float).tolist()]
 
 
 def generate_svg_string(
     # Animation sampling
-    N=360,  # samples per oscillation
+    N=120,  # samples per oscillation
     dur=0.9,  # seconds per oscillation
     # Canvas
     W=600,
@@ -33,115 +48,80 @@ def generate_svg_string(
     amp_deg=35.0,  # ± amplitude (deg) for back-and-forth swing
 ):
     # --- Helpers ---
-    def cross(ax, ay, bx, by):
-        return ax * by - ay * bx
-
-    def dot(ax, ay, bx, by):
-        return ax * bx + ay * by
-
-    def norm(ax, ay):
-        m = math.hypot(ax, ay)
-        return (ax / m, ay / m) if m != 0 else (0.0, 0.0)
-
     def clip_to_rect(x, y, rx, ry, W, H, eps=1e-9):
-        """Clip ray P(t)=(x,y)+t*(rx,ry), t>0 to rectangle [0,W]×[0,H]; return first boundary hit."""
-        ts = []
-        if abs(rx) > eps:
-            t = (W - x) / rx
-            if t > eps:
-                ts.append(t)
-            t = (0 - x) / rx
-            if t > eps:
-                ts.append(t)
-        if abs(ry) > eps:
-            t = (H - y) / ry
-            if t > eps:
-                ts.append(t)
-            t = (0 - y) / ry
-            if t > eps:
-                ts.append(t)
-        if not ts:
-            return (x, y)
-        tmin = min(ts)
+        """Clip rays P(t)=(x,y)+t*(rx,ry), t>0 to rectangle [0,W]×[0,H]; return first boundary hits.
+
+        x, y, rx, ry are arrays with one entry per ray.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ts = np.stack(
+                [(W - x) / rx, (0 - x) / rx, (H - y) / ry, (0 - y) / ry], axis=1
+            )
+        sx, sy = np.abs(rx) > eps, np.abs(ry) > eps
+        ok = (ts > eps) & np.stack([sx, sx, sy, sy], axis=1)
+        tmin = np.where(ok, ts, np.inf).min(axis=1)
+        hit = np.isfinite(tmin)  # rays with no boundary ahead stay put
+        tmin = np.where(hit, tmin, 0.0)
         ex, ey = x + rx * tmin, y + ry * tmin
         # clamp tiny drift
-        ex = min(max(ex, 0.0), W)
-        ey = min(max(ey, 0.0), H)
+        ex = np.where(hit, np.clip(ex, 0.0, W), x)
+        ey = np.where(hit, np.clip(ey, 0.0, H), y)
         return (ex, ey)
 
     # Normalize incident direction
     dlen = math.hypot(dx, dy)
     dx, dy = dx / dlen, dy / dlen
 
-    # Precompute samples
-    keys = []
-    # beam endpoints
-    hx, hy = [], []  # hit point on mirror
-    rx2, ry2 = [], []  # reflected beam clipped endpoint
+    # Precompute samples, all frames at once
+    keys = np.arange(N) / (N - 1)  # 0..1
     # mirror rotation values (deg)
-    rot_deg = []
-
-    for i in range(N):
-        tnorm = i / (N - 1)  # 0..1
-        theta_deg = theta0_deg + amp_deg * math.sin(2 * math.pi * tnorm)
-        theta = math.radians(theta_deg)
-        rot_deg.append(theta_deg)
-        keys.append(tnorm)
-
-        # Mirror local basis (tangent along mirror, normal perpendicular)
-        ux, uy = math.cos(theta), math.sin(theta)  # unit tangent
-        # choose normal so that d·n < 0 (incoming side)
-        n0x, n0y = -uy, ux  # one perpendicular
-        dn = dot(dx, dy, n0x, n0y)
-        if dn < 0:
-            nx, ny = n0x, n0y
-        else:
-            nx, ny = -n0x, -n0y
-            dn = -dn
-
-        # Ray–mirror intersection: S + t*d = M + s*u, |s| <= L
-        # cross((S - M) + t d, u) = 0  -> t = cross(M - S, u) / cross(d, u)
-        denom = cross(dx, dy, ux, uy)
-        # With chosen angles, denom stays nonzero; still guard:
-        if abs(denom) < 1e-10:
-            # fall back to previous valid point if any
-            if i == 0:
-                px, py = Sx, Sy
-                ex, ey = px, py
-            else:
-                px, py = hx[-1], hy[-1]
-                ex, ey = rx2[-1], ry2[-1]
-        else:
-            t = cross(cx - Sx, cy - Sy, ux, uy) / denom
-            px, py = (Sx + t * dx, Sy + t * dy)
-            # Position along mirror
-            s = dot(px - cx, py - cy, ux, uy)
-            if abs(s) > L:
-                # Beam misses finite mirror; clamp to end cap (visual continuity)
-                s_clamped = max(min(s, L), -L)
-                px, py = (cx + s_clamped * ux, cy + s_clamped * uy)
-
-            # Reflect: r = d - 2*(d·n)*n
-            rx, ry = dx - 2 * dn * nx, dy - 2 * dn * ny
-            ex, ey = clip_to_rect(px, py, rx, ry, W, H)
-
-        hx.append(px)
-        hy.append(py)
-        rx2.append(ex)
-        ry2.append(ey)
+    rot_deg = theta0_deg + amp_deg * np.sin(2 * math.pi * keys)
+    theta = np.radians(rot_deg)
+
+    # Mirror tangent u = (cos θ, sin θ). Reflecting d about the mirror line,
+    # r = d - 2(d·n)n = 2(d·u)u - d, only depends on 2θ (and not on which
+    # side the normal n points to).
+    ux, uy = np.cos(theta), np.sin(theta)
+    c2, s2 = np.cos(2 * theta), np.sin(2 * theta)
+    rx, ry = dx * c2 + dy * s2, dx * s2 - dy * c2
+
+    # Ray–mirror intersection: S + t*d = M + s*u, |s| <= L
+    # cross((S - M) + t d, u) = 0  -> t = cross(M - S, u) / cross(d, u)
+    denom = dx * uy - dy * ux
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = ((cx - Sx) * uy - (cy - Sy) * ux) / denom
+    px, py = Sx + t * dx, Sy + t * dy
+    # Position along mirror; if the beam misses the finite mirror, clamp to
+    # the end cap (visual continuity)
+    s = (px - cx) * ux + (py - cy) * uy
+    miss = np.abs(s) > L
+    s = np.clip(s, -L, L)
+    px = np.where(miss, cx + s * ux, px)
+    py = np.where(miss, cy + s * uy, py)
+
+    # With chosen angles, denom stays nonzero; still guard: such frames fall
+    # back to the previous valid frame, or the source if there is none yet
+    valid = np.abs(denom) >= 1e-10
+    last = np.maximum.accumulate(np.where(valid, np.arange(N), 0))
+    hx = np.where(valid, px, Sx)[last]  # hit point on mirror
+    hy = np.where(valid, py, Sy)[last]
+    rx, ry = np.where(valid, rx, 0.0)[last], np.where(valid, ry, 0.0)[last]
+
+    # Clip all reflected rays to the viewport in one pass
+    rx2, ry2 = clip_to_rect(hx, hy, rx, ry, W, H)
 
     # --- Formatting for SMIL ---
     def fmt_vals(vals):
-        out = []
-        for v in vals:
-            if abs(v - round(v)) < 1e-6:
-                out.append(f"{round(v):.0f}")
-            else:
-                out.append(f"{v:.2f}")
-        return ";".join(out)
+        return ";".join(fmt_array(vals))
 
-    def fmt_keys(keys):
-        return ";".join(f"{k:.6f}" for k in keys)
+    def fmt_points(*points):
+        # Frames of "x,y x,y ..." with one vertex taken from each (xs, ys) pair
+        pair = f"%.{PREC}f,%.{PREC}f"
+        verts = [
+            [pair % p for p in zip(np.asarray(xs).tolist(), np.asarray(ys).tolist())]
+            for xs, ys in points
+        ]
+        return ";".join(" ".join(frame) for frame in zip(*verts))
 
     # SVG mirror shape: rectangle centered at origin, rotated inside a translated group
     rect_x = -L
@@ -153,42 +133,33 @@ def generate_svg_string(
 <svg xmlns="http://www.w3.org/2000/svg" width="{W}" height="{H}" viewBox="0 0 {W} {H}">
   <style>
     .mirror {{ fill:#ddd; stroke:#8a8f98; stroke-width:2; vector-effect:non-scaling-stroke }}
-    .beam   {{ stroke:#ff2a2a; stroke-width:4; stroke-linecap:round; vector-effect:non-scaling-stroke }}
+    .beam   {{ fill:none; stroke:#ff2a2a; stroke-width:4; stroke-linecap:round; vector-effect:non-scaling-stroke }}
     .out    {{ stroke-width:4 }}
   </style>
 
   <!-- Incident beam: source -> hit point -->
-  <line class="beam" x1="{Sx:.2f}" y1="{Sy:.2f}" x2="{hx[0]:.2f}" y2="{hy[0]:.2f}">
-    <animate attributeName="x2" dur="{dur}s" repeatCount="indefinite" calcMode="linear"
-      keyTimes="{fmt_keys(keys)}" values="{fmt_vals(hx)}"/>
-    <animate attributeName="y2" dur="{dur}s" repeatCount="indefinite" calcMode="linear"
-      keyTimes="{fmt_keys(keys)}" values="{fmt_vals(hy)}"/>
-  </line>
+  <polyline class="beam" points="{fmt(Sx)},{fmt(Sy)} {fmt(hx[0])},{fmt(hy[0])}">
+    <animate attributeName="points" dur="{dur}s" repeatCount="indefinite" calcMode="linear"
+      values="{fmt_points(([Sx] * N, [Sy] * N), (hx, hy))}"/>
+  </polyline>
 
   <!-- Reflected beam: hit point -> clipped viewport edge -->
-  <line class="beam out" x1="{hx[0]:.2f}" y1="{hy[0]:.2f}" x2="{rx2[0]:.2f}" y2="{ry2[0]:.2f}">
-    <animate attributeName="x1" dur="{dur}s" repeatCount="indefinite" calcMode="linear"
-      keyTimes="{fmt_keys(keys)}" values="{fmt_vals(hx)}"/>
-    <animate attributeName="y1" dur="{dur}s" repeatCount="indefinite" calcMode="linear"
-      keyTimes="{fmt_keys(keys)}" values="{fmt_vals(hy)}"/>
-    <animate attributeName="x2" dur="{dur}s" repeatCount="indefinite" calcMode="linear"
-      keyTimes="{fmt_keys(keys)}" values="{fmt_vals(rx2)}"/>
-    <animate attributeName="y2" dur="{dur}s" repeatCount="indefinite" calcMode="linear"
-      keyTimes="{fmt_keys(keys)}" values="{fmt_vals(ry2)}"/>
-  </line>
+  <polyline class="beam out" points="{fmt(hx[0])},{fmt(hy[0])} {fmt(rx2[0])},{fmt(ry2[0])}">
+    <animate attributeName="points" dur="{dur}s" repeatCount="indefinite" calcMode="linear"
+      values="{fmt_points((hx, hy), (rx2, ry2))}"/>
+  </polyline>
 
   <!-- Oscillating flat mirror at ({cx}, {cy}) -->
   <g transform="translate({cx},{cy})">
-    <rect class="mirror" x="{rect_x:.2f}" y="{rect_y:.2f}" width="{rect_w:.2f}" height="{rect_h:.2f}" rx="{rect_h / 2:.2f}" ry="{rect_h / 2:.2f}">
+    <rect class="mirror" x="{fmt(rect_x)}" y="{fmt(rect_y)}" width="{fmt(rect_w)}" height="{fmt(rect_h)}" rx="{fmt(rect_h / 2)}" ry="{fmt(rect_h / 2)}">
       <animateTransform attributeName="transform" type="rotate"
         dur="{dur}s" repeatCount="indefinite" calcMode="linear"
-        keyTimes="{fmt_keys(keys)}"
         values="{fmt_vals(rot_deg)}"/>
     </rect>
   </g>
 
   <!-- Tiny source marker -->
-  <circle cx="{Sx:.2f}" cy="{Sy:.2f}" r="3" fill="#ff2a2a"/>
+  <circle cx="{fmt(Sx)}" cy="{fmt(Sy)}" r="3" fill="#ff2a2a"/>
 </svg>
 '''
     return svg
@@ -196,7 +167,7 @@ def generate_svg_string(
 
 def main(out_path="flat_mirror_scanner.svg"):
     svg = generate_svg_string(
-        N=360,  # smoothness
+        N=120,  # smoothness
         dur=10.0,  # seconds per oscillation
         # You can tweak geometry/angles here; defaults are chosen so the beam always hits.
         # theta0_deg=40.0, amp_deg=20.0, L=200 keep intersection on-segment for the chosen S and M.
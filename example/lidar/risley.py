@@ -13,7 +13,8 @@ Requirements from user:
 """
 
 import math
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Sequence, Tuple
 
 Pt = Tuple[float, float]
 
@@ -21,7 +22,7 @@ Pt = Tuple[float, float]
 # ---------- math helpers ----------
 def normalize(v: Pt) -> Pt:
     x, y = v
-    n = math.hypot(x, y)
+    n = math.sqrt(x * x + y * y)
     return (x / n, y / n)
 
 
@@ -33,7 +34,7 @@ def face_normal(a: Pt, b: Pt) -> Pt:
     # +90° rotation of edge vector gives one of the two valid normals.
     t = (b[0] - a[0], b[1] - a[1])
     n = (-t[1], t[0])
-    nlen = math.hypot(*n)
+    nlen = math.sqrt(n[0] * n[0] + n[1] * n[1])
     return (n[0] / nlen, n[1] / nlen)
 
 
@@ -74,7 +75,7 @@ def refract(incident: Pt, N: Pt, n1: float, n2: float, eps: float = 1e-9) -> Pt:
 
     tx = eta * Ix + (eta * cosi - cost) * Nx
     ty = eta * Iy + (eta * cosi - cost) * Ny
-    return normalize((tx, ty))
+    return (tx, ty)  # already unit length for unit I and N
 
 
 # ---------- geometry builders ----------
@@ -114,6 +115,7 @@ def make_right_wedge(
     return pts, slanted, vertical
 
 
+@lru_cache(maxsize=None)
 def trace_pair(
     y_center: float,
     y_top: float,
@@ -126,11 +128,12 @@ def trace_pair(
     n_air: float = 1.0,
     n_glass: float = 1.5,
     endx: float = 870.0,
-) -> Tuple[List[Pt], List[Pt], List[Pt]]:
+) -> Tuple[Tuple[Pt, ...], Tuple[Pt, ...], Tuple[Pt, ...]]:
     """
     Trace beam through a pair of wedges.
     - If co_rotate=True, wedges add deviation; else they counter-rotate to (nearly) cancel.
     Returns (beam_points, left_triangle_pts, right_triangle_pts)
+    Results are memoized, so the point lists are returned as (immutable) tuples.
     """
     x_right_inner = x_left_inner + gap
 
@@ -173,32 +176,33 @@ def trace_pair(
     t_end = (endx - p[0]) / d[0]
     beam.append((endx, p[1] + t_end * d[1]))
 
-    return beam, L_pts, R_pts
+    return tuple(beam), tuple(L_pts), tuple(R_pts)
 
 
 # ---------- build the scene ----------
-def fmt_points(pts: List[Pt]) -> str:
+def fmt_points(pts: Sequence[Pt]) -> str:
     return " ".join(f"{x:.2f},{y:.2f}" for x, y in pts)
 
 
-# Layout parameters
-VIEW_W, VIEW_H = 920, 640
-top_top, top_bottom = 100.0, 220.0
-bottom_top, bottom_bot = 380.0, 500.0
-center_top = (top_top + top_bottom) / 2
-center_bottom = (bottom_top + bottom_bot) / 2
-x_left_inner, gap, width = 420.0, 60.0, 60.0  # feel free to tweak
-
-# Trace both rows
-beam_top, L1, R1 = trace_pair(
-    center_top, top_top, top_bottom, x_left_inner, gap, width, co_rotate=True
-)
-beam_bot, L2, R2 = trace_pair(
-    center_bottom, bottom_top, bottom_bot, x_left_inner, gap, width, co_rotate=False
-)
-
-# ---------- output SVG ----------
-svg = f"""<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {VIEW_W} {VIEW_H}" width="{VIEW_W}" height="{VIEW_H}">
+def main() -> None:
+    # Layout parameters
+    VIEW_W, VIEW_H = 920, 640
+    top_top, top_bottom = 100.0, 220.0
+    bottom_top, bottom_bot = 380.0, 500.0
+    center_top = (top_top + top_bottom) / 2
+    center_bottom = (bottom_top + bottom_bot) / 2
+    x_left_inner, gap, width = 420.0, 60.0, 60.0  # feel free to tweak
+
+    # Trace both rows
+    beam_top, L1, R1 = trace_pair(
+        center_top, top_top, top_bottom, x_left_inner, gap, width, co_rotate=True
+    )
+    beam_bot, L2, R2 = trace_pair(
+        center_bottom, bottom_top, bottom_bot, x_left_inner, gap, width, co_rotate=False
+    )
+
+    # ---------- output SVG ----------
+    svg = f"""<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {VIEW_W} {VIEW_H}" width="{VIEW_W}" height="{VIEW_H}">
   <style>
     .prism {{ fill:#ddd; stroke:#8a8f98; stroke-width:2; vector-effect:non-scaling-stroke }}
     .beam  {{ fill:none; stroke:#ff2a2a; stroke-width:4; stroke-linecap:round; vector-effect:non-scaling-stroke }}
@@ -215,5 +219,8 @@ svg = f"""<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {VIEW_W} {VIEW_H}
   <polyline class="beam" points="{fmt_points(beam_bot)}"/>
 </svg>
 """
+    print(svg)
+
 
-print(svg)
+if __name__ == "__main__":
+    main()
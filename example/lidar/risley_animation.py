@@ -9,8 +9,8 @@ Generate an animated SVG of a Risley prism scan (script-free).
 Tip: If the output file is too large, reduce STEPS (fewer points).
 """
 
-import math
 from pathlib import Path
+import numpy as np
 
 
 def risley_points(
@@ -25,45 +25,41 @@ def risley_points(
     omega,
 ):
     """
-    Return list of (x, y) points for the scan.
+    Return an (N, 2) array of (x, y) points for the scan.
     Matches the JS loop:
         for each frame: do seg_per_frame steps of theta += dtheta, emit point
         total frames = seconds * fps
     """
     total_steps = int(seconds * fps * seg_per_frame)
     a = a_ratio * r
-    theta = 0.0
 
-    pts = []
-    # Optionally add the initial point (before the first increment)
-    # We'll match the canvas behavior more closely by starting after first increment.
-    length = 0
-    lastx = 0
-    lasty = 0
+    # We match the canvas behavior by starting after the first increment.
+    theta = np.arange(1, total_steps + 1, dtype=np.float64)
+    theta *= dtheta
+    wt = theta * omega
 
-    for _ in range(total_steps):
-        theta += dtheta
-        x = r + a * math.sin(theta) + a * math.sin(omega * theta)
-        y = r + a * math.cos(theta) + a * math.cos(omega * theta)
-
-        length += math.sqrt((x - lastx) ** 2 + (y - lasty) ** 2)
-
-        lastx = x
-        lasty = y
-        pts.append((x, y))
-    return pts, length
+    # Fill the output columns in place so long scans don't pile up temporaries
+    pts = np.empty((total_steps, 2))
+    x, y = pts[:, 0], pts[:, 1]
+    np.sin(theta, out=x)
+    x += np.sin(wt)
+    np.cos(theta, out=y)
+    y += np.cos(wt, out=wt)
+    pts *= a
+    pts += r
+    return pts
 
 
 def build_path_d(points, precision=1):
-    if not points:
+    if len(points) == 0:
         return "M0 0"
-    fmt = f"{{:.{precision}f}}"
-    x0, y0 = points[0]
-    parts = [f"M{fmt.format(x0)} {fmt.format(y0)}"]
+    if precision == 0:
+        # Whole pixels: print rounded ints (no "-0", no trailing ".")
+        pair, points = "%d %d", np.rint(points).astype(np.int32)
+    else:
+        pair = f"%.{precision}f %.{precision}f"
     # Use 'L' commands; browsers handle very long paths fine
-    for x, y in points[1:]:
-        parts.append(f"L{fmt.format(x)} {fmt.format(y)}")
-    return " ".join(parts)
+    return "M" + " L".join([pair % p for p in map(tuple, points.tolist())])
 
 
 def generate_svg(
@@ -79,7 +75,7 @@ def generate_svg(
     stroke_width=2,
     precision=1,
 ):
-    pts, length = risley_points(
+    pts = risley_points(
         W=W,
         H=H,
         r=min(W, H) / 2.0,
@@ -92,7 +88,8 @@ def generate_svg(
     )
     d = build_path_d(pts, precision=precision)
 
-    # Normalize path length to 1000 units so we can animate dashoffset easily.
+    # Normalize path length to 1000 units so we can animate dashoffset easily
+    # (pathLength is just a declared scale, so the true arc length isn't needed).
     # We start fully hidden (dashoffset=1000) and reveal to 0 over 'seconds'.
     svg = f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg xmlns="http://www.w3.org/2000/svg"
@@ -109,11 +106,11 @@ def generate_svg(
 
   <path class="trace"
         d="{d}"
-        pathLength="{length}"
-        stroke-dasharray="{length}"
+        pathLength="1000"
+        stroke-dasharray="1000"
         stroke-dashoffset="0">
     <animate attributeName="stroke-dashoffset"
-             from="{length}" to="0"
+             from="1000" to="0"
              dur="{seconds}s"
              repeatCount="indefinite"/>
   </path>
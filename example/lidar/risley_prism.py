@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 import math
-from pathlib import Path
+import multiprocessing
 import numpy as np
 
 res_mult = 1.0
@@ -17,60 +17,85 @@ gap_z = 30.0 * res_mult
 stroke = 2.2 * res_mult
 
 
-def iso_project(p):
-    return (
-        np.array([width / 2, height / 2])
-        + np.array([[np.sqrt(3) / 2, 0, -np.sqrt(3) / 2], [-0.5, 1, -0.5]]) @ p
-        # + np.array([[0, 1, 0], [0, 0, 1]]) @ p
-    )
+iso_matrix = np.array([[np.sqrt(3) / 2, 0, -np.sqrt(3) / 2], [-0.5, 1, -0.5]])
+# iso_matrix = np.array([[0, 1, 0], [0, 0, 1]])
+iso_center = np.array([width / 2, height / 2])
+
+
+def iso_project(P):
+    """Project (3,) or (N, 3) points to (2,) or (N, 2) canvas coordinates."""
+    return P @ iso_matrix.T + iso_center
+
+
+# Prism rim samples, shared by every face of both prisms in every frame
+ring_angles = np.linspace(0, np.pi * 2, 360, endpoint=False)  # "Z" closes the loop
+ring_x = np.cos(ring_angles) * R
+ring_y = np.sin(ring_angles) * R
+# silhouette swap at ~±45° azimuth for isometric view
+outline_back = (np.arange(360) > 180 - 45) & (np.arange(360) <= 360 - 45)
+
+
+def lift_ring(z):
+    """Rim points lifted to height(s) z; returns a (360, 3) array."""
+    return np.column_stack([ring_x, ring_y, np.broadcast_to(z, ring_x.shape)])
+
+
+def project_ring(z):
+    return iso_project(lift_ring(z))
+
+
+# The flat faces facing the gap do not move between frames
+ring_gap_top = project_ring(gap_z / 2)
+ring_gap_bottom = project_ring(-gap_z / 2)
+
+
+def polyline_from_points(pts):
+    pairs = ["%.3f,%.3f" % (x, y) for x, y in np.asarray(pts).tolist()]
+    return "M" + pairs[0] + " L" + " L".join(pairs[1:])
 
 
 def path_from_points(pts):
-    d = [f"M{pts[-1][0]:.3f},{pts[-1][1]:.3f}"]
-    for pt in pts:
-        d.append(f"L{pt[0]:.3f},{pt[1]:.3f}")
-    d.append("Z")
-    return " ".join(d)
+    return polyline_from_points(pts) + " Z"
 
 
 # ---------- Planes & ray tracing helpers ----------
 
 
+# 3-vectors in the tracer are plain (x, y, z) tuples: for three components,
+# scalar arithmetic is far cheaper than creating and dispatching on ndarrays.
+
+
+def dot3(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
 def unit(v):
-    v = np.asarray(v, float)
-    n = np.linalg.norm(v)
-    return v / n
+    n = math.sqrt(dot3(v, v))
+    return (v[0] / n, v[1] / n, v[2] / n)
 
 
-def plane_from_tilt(z0, psi_deg, slope):
+def plane_from_tilt(z0, u, slope):
     """
     Elliptical face plane:
         z = z0 + slope * (u · [x,y])
+    with u = (cos psi, sin psi) the face azimuth.
     Put in n·p = d form with n = (-slope*u_x, -slope*u_y, 1), d = z0
     """
-    u = np.array([math.cos(math.radians(psi_deg)), math.sin(math.radians(psi_deg))])
-    n = np.array([-slope * u[0], -slope * u[1], 1.0])
+    n = (-slope * u[0], -slope * u[1], 1.0)
     d = z0
     return unit(n), d
 
 
-def plane_flat(z0, normal_sign=+1):
-    # Flat face orthogonal to z (z = z0). normal_sign=+1 gives +z normal; -1 gives -z.
-    n = np.array([0.0, 0.0, float(normal_sign)])
-    d = z0
-    return n, d
-
-
 def intersect_ray_plane(p0, v, n, d):
     """
     Ray p(t) = p0 + t*v with plane n·p = d.
     Returns (t, p_hit). Assumes not parallel.
     """
-    denom = float(np.dot(n, v))
+    denom = dot3(n, v)
     if abs(denom) < 1e-12:
         return None, None
-    t = (d - float(np.dot(n, p0))) / denom
-    return t, p0 + t * v
+    t = (d - dot3(n, p0)) / denom
+    return t, (p0[0] + t * v[0], p0[1] + t * v[1], p0[2] + t * v[2])
 
 
 def refract_dir(v, n, n1, n2):
@@ -82,60 +107,67 @@ def refract_dir(v, n, n1, n2):
     v = unit(v)
     n = unit(n)
     # Ensure n points into the incident medium
-    if np.dot(v, n) > 0:
-        n = -n
+    if dot3(v, n) > 0:
+        n = (-n[0], -n[1], -n[2])
         n1, n2 = n2, n1
     eta = n1 / n2
-    cosi = -float(np.dot(n, v))
+    cosi = -dot3(n, v)
     k = 1.0 - eta**2 * (1.0 - cosi**2)
     if k < 0.0:
         return None  # total internal reflection (won't happen here with gentle wedges)
-    t = eta * v + (eta * cosi - math.sqrt(k)) * n
-    return unit(t)
+    c = eta * cosi - math.sqrt(k)
+    # Already unit length (to rounding) since v and n are unit
+    return (eta * v[0] + c * n[0], eta * v[1] + c * n[1], eta * v[2] + c * n[2])
 
 
-# ---------- Geometry for the two prisms (your original rendering) ----------
+# Flat faces (z = z0) are special-cased in closed form: the hit point is one
+# division away, and Snell only scales the transverse direction by n1/n2.
 
 
-def prisms_paths(psi1_deg, psi2_deg):
-    pts_prism_1_back = []
-    pts_prism_1_front = []
-    pts_prism_1_outline = []
+def intersect_flat(p0, v, z0):
+    """Ray p(t) = p0 + t*v with the plane z = z0; returns p_hit."""
+    t = (z0 - p0[2]) / v[2]
+    return (p0[0] + t * v[0], p0[1] + t * v[1], p0[2] + t * v[2])
 
-    pts_prism_2_back = []
-    pts_prism_2_front = []
-    pts_prism_2_outline = []
 
-    dir_prism_1 = np.array(
-        [np.cos(math.radians(psi1_deg)), np.sin(math.radians(psi1_deg))]
-    )
-    dir_prism_2 = np.array(
-        [np.cos(math.radians(psi2_deg)), np.sin(math.radians(psi2_deg))]
-    )
+def refract_flat(v, n1, n2):
+    """Unit direction v crossing a z = const face from index n1 into n2."""
+    eta = n1 / n2
+    tx, ty = eta * v[0], eta * v[1]
+    tz = math.copysign(math.sqrt(1.0 - tx * tx - ty * ty), v[2])
+    return (tx, ty, tz)
+
 
-    for i, angle in enumerate(np.linspace(0, np.pi * 2, 360)):
-        x = np.cos(angle) * R
-        y = np.sin(angle) * R
+# ---------- Geometry for the two prisms (your original rendering) ----------
+
+
+def prisms_paths(u1, u2):
+    # u1, u2: (cos psi, sin psi) azimuths of the two prism wedges
+    d1x, d1y = u1
+    d2x, d2y = u2
 
-        # planes as z(x,y)
-        front_z = np.dot(np.array([x, y]), dir_prism_1) * slope + thickness
-        back_z = -np.dot(np.array([x, y]), dir_prism_2) * slope - thickness
+    # planes as z(x,y)
+    front_z = (ring_x * d1x + ring_y * d1y) * slope + thickness
+    back_z = -(ring_x * d2x + ring_y * d2y) * slope - thickness
 
-        pts_prism_1_back.append(iso_project(np.array([x, y, front_z + gap_z / 2])))
-        pts_prism_1_front.append(iso_project(np.array([x, y, gap_z / 2])))
+    # Project both moving faces and all beam breakpoints in a single matmul
+    beams = trace_beam_polyline(u1, u2)
+    parts = [lift_ring(front_z + gap_z / 2), lift_ring(back_z - gap_z / 2), *beams]
+    offsets = np.cumsum([len(part) for part in parts[:-1]])
+    pts_prism_1_back, pts_prism_2_front, *beams2d = np.split(
+        iso_project(np.concatenate(parts)), offsets
+    )
+    beam_path = [
+        f'<path class="beam" d="{polyline_from_points(beam)}" />' for beam in beams2d
+    ]
 
-        pts_prism_2_back.append(iso_project(np.array([x, y, -gap_z / 2])))
-        pts_prism_2_front.append(iso_project(np.array([x, y, back_z - gap_z / 2])))
+    pts_prism_1_front = ring_gap_top
+    pts_prism_2_back = ring_gap_bottom
 
-        # silhouette swap at ~±45° azimuth for isometric view
-        if 180 - 45 < i <= 360 - 45:
-            pts_prism_1_outline.append(pts_prism_1_back[-1])
-            pts_prism_2_outline.append(pts_prism_2_back[-1])
-        else:
-            pts_prism_1_outline.append(pts_prism_1_front[-1])
-            pts_prism_2_outline.append(pts_prism_2_front[-1])
+    mask = outline_back[:, None]
+    pts_prism_1_outline = np.where(mask, pts_prism_1_back, pts_prism_1_front)
+    pts_prism_2_outline = np.where(mask, pts_prism_2_back, pts_prism_2_front)
 
-    beam_path = trace_beam_polyline(psi1_deg, psi2_deg)
     out = [
         beam_path[0],
         f'<path class="face back" d="{path_from_points(pts_prism_1_back)}"/>',
@@ -153,106 +185,106 @@ def prisms_paths(psi1_deg, psi2_deg):
 # ---------- Red laser tracing through the prisms ----------
 
 
-def trace_beam_polyline(psi1_deg, psi2_deg):
+def trace_beam_polyline(u1, u2):
     # Ray starts well before the first prism on the optical axis, traveling +z.
-    p = np.array([0.0, 0.0, 1000.0])
-    v = np.array([0.0, 0.0, -1.0])
+    p = (0.0, 0.0, 1000.0)
+    v = (0.0, 0.0, -1.0)
 
     beam01 = []
     beam12 = []
     beam23 = []
 
-    beam01 = [p.copy()]  # collect 3D breakpoints
+    beam01 = [p]  # collect 3D breakpoints
 
     # ----- Prism 1 -----
     # Back (tilted): z = gap/2 + thickness + slope*(u1·[x,y])
-    n_b1, d_b1 = plane_from_tilt(+gap_z / 2.0 + thickness, psi1_deg, slope)
+    n_b1, d_b1 = plane_from_tilt(+gap_z / 2.0 + thickness, u1, slope)
     _, p = intersect_ray_plane(beam01[-1], v, n_b1, d_b1)
     beam01.append(p)
     v = refract_dir(v, n_b1, n_air, n_glass)
 
-    # Front (flat): z = +gap_z/2, normal pointing INTO air on the incident side is -z
-    n_f1, d_f1 = plane_flat(+gap_z / 2.0, normal_sign=+1)
-    _, p = intersect_ray_plane(beam01[-1], v, n_f1, d_f1)
+    # Front (flat): z = +gap_z/2
+    p = intersect_flat(beam01[-1], v, +gap_z / 2.0)
     beam01.append(p)
-    beam12.append(p.copy())
-    v = refract_dir(v, n_f1, n_glass, n_air)
+    beam12.append(p)
+    v = refract_flat(v, n_glass, n_air)
 
     # ----- Prism 2 -----
-    # Back (flat): z = -gap/2, normal pointing into air on incident side is +z
-    n_b2, d_b2 = plane_flat(-gap_z / 2.0, normal_sign=+1)
-    _, p = intersect_ray_plane(beam12[-1], v, n_b2, d_b2)
+    # Back (flat): z = -gap/2
+    p = intersect_flat(beam12[-1], v, -gap_z / 2.0)
     beam12.append(p)
-    v = refract_dir(v, n_b2, n_air, n_glass)
+    v = refract_flat(v, n_air, n_glass)
 
     # Front (tilted): z = -gap/2 - thickness + slope*(u2·[x,y])
-    n_f2, d_f2 = plane_from_tilt(-gap_z / 2.0 - thickness, psi2_deg, -slope)
+    n_f2, d_f2 = plane_from_tilt(-gap_z / 2.0 - thickness, u2, -slope)
     _, p = intersect_ray_plane(beam12[-1], v, n_f2, d_f2)
     beam12.append(p)
-    beam23.append(p.copy())
+    beam23.append(p)
     v = refract_dir(v, n_f2, n_glass, n_air)
 
     # ----- After prisms: extend beam forward so it exits the canvas
-    p_end = beam23[-1] + 2000.0 * v
+    p = beam23[-1]
+    p_end = (p[0] + 2000.0 * v[0], p[1] + 2000.0 * v[1], p[2] + 2000.0 * v[2])
     beam23.append(p_end)
 
     print("final v:", v)
 
-    # Project to 2D for SVG polyline
-
-    paths = []
-    for beam in (beam01, beam12, beam23):
-        pts2d = [iso_project(q) for q in beam]
-        d = f"M{pts2d[0][0]:.3f},{pts2d[0][1]:.3f} " + " ".join(
-            f"L{q[0]:.3f},{q[1]:.3f}" for q in pts2d[1:]
-        )
-        paths.append(f'<path class="beam" d="{d}" />')
-    return paths
+    # 3D breakpoints of each segment; the caller projects them
+    return beam01, beam12, beam23
 
 
 # ---------- Main SVG ----------
 
+# Static document prefix/suffix, built once; the style sheet is kept compact
+# since it is repeated in every frame file.
+svg_head = (
+    f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}"'
+    f' viewBox="0 0 {width:.1f} {height:.1f}">\n<style>\n'
+    f".face{{fill:none;stroke:#111;stroke-width:{stroke};"
+    "vector-effect:non-scaling-stroke}\n"
+    ".face.outline{fill:rgba(190,200,255,0.5)}\n"
+    ".face.outline.magenta{fill:rgba(255,160,255,0.5)}\n"
+    f".edge{{stroke:#111;fill:none;stroke-width:{stroke};"
+    "vector-effect:non-scaling-stroke}\n"
+    ".beam{stroke:#ff2a2a;stroke-width:3.5;fill:none;stroke-linecap:round;"
+    "vector-effect:non-scaling-stroke}\n"
+    "</style>\n"
+)
+svg_tail = "\n</svg>\n"
+
 
 def make_svg(
     psi1_deg=-90,
     psi2_deg=-90,
 ):
-    shape_paths = prisms_paths(psi1_deg, psi2_deg)
-
-    svg = (
-        f"""<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}"
-        viewBox="0 0 {width:.1f} {height:.1f}">
-    <style>
-    .face {{ fill: none; stroke: #111; stroke-width: {stroke}; vector-effect: non-scaling-stroke; }}
-    .face.outline {{ fill: rgba(190, 200, 255, 0.5); stroke-width: {stroke};
-                     vector-effect: non-scaling-stroke; }}
-    .face.outline.magenta {{ fill: rgba(255, 160, 255, 0.5); stroke-width: {stroke};
-                     vector-effect: non-scaling-stroke; }}
-    .edge {{ stroke: #111; fill: none; stroke-width: {stroke}; vector-effect: non-scaling-stroke; }}
-    .beam {{ stroke: #ff2a2a; stroke-width: 3.5; fill: none; stroke-linecap: round;
-             vector-effect: non-scaling-stroke; }}
-    </style>
-    """
-        + "\n".join(shape_paths)
-        + "</svg>"
-    )
-    return svg
+    # Wedge azimuths as unit vectors, shared by the outlines and the tracer
+    psi1, psi2 = math.radians(psi1_deg), math.radians(psi2_deg)
+    u1 = (math.cos(psi1), math.sin(psi1))
+    u2 = (math.cos(psi2), math.sin(psi2))
+    shape_paths = prisms_paths(u1, u2)
+
+    return svg_head + "\n".join(shape_paths) + svg_tail
+
+
+# Animation schedule: both wedges return to their start after 11 * 14 * mult frames
+mult = 2
+n_frames = 11 * 14 * mult
+psi_1_start, psi_2_start = -90, 90
+speed1 = 360 / 11 / mult  # deg / frame
+speed2 = -360 / 14 / mult  # deg / frame
+
+
+def render_frame(frame):
+    svg = make_svg(psi_1_start + speed1 * frame, psi_2_start + speed2 * frame)
+    # Encode once and write raw bytes in a single call, skipping the text layer
+    with open(f"risley_prisms_isometric_{frame:04d}.svg", "wb", buffering=1 << 20) as f:
+        f.write(svg.encode("utf-8"))
 
 
 def main():
-    psi_1 = -90
-    psi_2 = 90
-    mult = 2
-    speed1 = 360 / 11 / mult  # deg / frame
-    speed2 = -360 / 14 / mult  # deg / frame
-
-    for frame in range(11 * 14 * mult):
-        svg = make_svg(psi_1, psi_2)
-        psi_1 += speed1
-        psi_2 += speed2
-        Path(f"risley_prisms_isometric_{frame:04d}.svg").write_text(
-            svg, encoding="utf-8"
-        )
+    # Frames are independent, so render them on all cores
+    with multiprocessing.Pool() as pool:
+        pool.map(render_frame, range(n_frames), chunksize=8)
 
 
 if __name__ == "__main__":